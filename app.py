@@ -8,11 +8,24 @@ DEMO MODE: Using mock data for UI testing
 import os
 import streamlit as st
 import requests
+from collections import Counter
 from datetime import datetime
-from typing import Dict, List, Optional
-import json
-from dotenv import load_dotenv
-load_dotenv()
+from typing import List, Optional, Tuple
+
+from dashboard_common import (
+    Incident,
+    display_incident_table,
+    get_http_session,
+    get_json,
+    priority_icon,
+)
+
+# .env is optional - hosted deployments inject variables directly
+try:
+    from dotenv import load_dotenv
+    load_dotenv()
+except ImportError:
+    pass
 
 
 # Page config
@@ -26,11 +39,21 @@ st.set_page_config(
 SPIKE_API_KEY = os.getenv("SPIKE_API_KEY")
 SPIKE_TEAM_ID = os.getenv("SPIKE_TEAM_ID")
 SPIKE_BASE_URL = "https://api.spike.sh"
+SPIKE_HEADERS = {
+    "x-api-key": SPIKE_API_KEY,
+    "x-team-id": SPIKE_TEAM_ID,
+    "Accept": "*/*"
+}
 
 # AI Model - using Claude via Anthropic API
 ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
 
 
+
+SPIKE_SESSION = get_http_session("spike")
+SPIKE_SESSION.headers.update(SPIKE_HEADERS)
+
+
 def check_env_vars():
     """Validate required environment variables"""
     missing = []
@@ -47,38 +70,26 @@ def check_env_vars():
         st.stop()
 
 
-def fetch_spike_incidents(status: str = "triggered"):
-    url = f"{SPIKE_BASE_URL}/incidents"
+@st.cache_data(ttl=15, show_spinner=False)
+def load_spike_incidents(status: str = "triggered") -> List[Incident]:
+    """Fetch incidents from Spike API (raises on failure, see get_json)"""
+    data = get_json(SPIKE_SESSION, f"{SPIKE_BASE_URL}/incidents")
+    return [Incident.from_dict(d) for d in data.get("data", [])]
 
-    headers = {
-        "x-api-key": SPIKE_API_KEY,
-        "x-team-id": SPIKE_TEAM_ID,
-        "Accept": "*/*"
-    }
 
+def fetch_spike_incidents(status: str = "triggered") -> Tuple[List[Incident], Optional[str]]:
+    """Fetch incidents from Spike API, returning (incidents, error message)"""
     try:
-        response = requests.get(url, headers=headers, timeout=10)
-
-        if response.status_code != 200:
-            st.error(f"Spike API error: {response.status_code}")
-            return []
-
-        data = response.json()
-        return data.get("data", [])
+        return load_spike_incidents(status), None
 
+    except requests.exceptions.HTTPError as e:
+        return [], f"Spike API error: {e.response.status_code}"
     except Exception as e:
-        st.error(f"Error fetching incidents: {e}")
-        return []
+        return [], f"Error fetching incidents: {e}"
 
 
 def create_test_incident() -> bool:
     """Create a test incident via Spike API"""
-    headers = {
-        "x-api-key": SPIKE_API_KEY,
-        "x-team-id": SPIKE_TEAM_ID,
-        "Content-Type": "application/json"
-    }
-    
     url = f"{SPIKE_BASE_URL}/incidents"
     
     payload = {
@@ -89,14 +100,14 @@ def create_test_incident() -> bool:
     }
     
     try:
-        response = requests.post(url, headers=headers, json=payload, timeout=10)
+        response = SPIKE_SESSION.post(url, json=payload, timeout=(3, 10))
         return response.status_code in [200, 201]
     except Exception as e:
         st.error(f"Failed to create incident: {e}")
         return False
 
 
-def analyze_with_ai(incidents: List[Dict], analysis_type: str) -> str:
+def analyze_with_ai(incidents: List[Incident], analysis_type: str) -> str:
     """
     Analyze incidents with AI
     Using Claude via Anthropic API for real analysis
@@ -104,11 +115,15 @@ def analyze_with_ai(incidents: List[Dict], analysis_type: str) -> str:
     if not incidents:
         return "No incidents to analyze"
     
-    # Format incidents for analysis
-    incident_text = "\n".join([
-        f"- {inc.get('title', 'Unknown')} (Priority: {inc.get('priority', 'unknown')}, Severity: {inc.get('severity', 'unknown')})\n  Details: {inc.get('metadata', 'No details')}"
-        for inc in incidents
-    ])
+    # Format incidents for analysis and count priorities in the same pass
+    lines = []
+    priority_counts = Counter()
+    for inc in incidents:
+        priority_counts[inc.priority] += 1
+        lines.append(
+            f"- {inc.title} (Priority: {inc.priority}, Severity: {inc.severity})\n  Details: {inc.metadata or 'No details'}"
+        )
+    incident_text = "\n".join(lines)
     
     if analysis_type == "categorize":
         return f"""
@@ -122,10 +137,10 @@ Analyzing {len(incidents)} active incident(s) from Spike API
 
 ### Distribution:
 - Total Incidents: {len(incidents)}
-- Critical (P1): {sum(1 for i in incidents if i.get('priority') == 'p1')}
-- High (P2): {sum(1 for i in incidents if i.get('priority') == 'p2')}
-- Medium (P3): {sum(1 for i in incidents if i.get('priority') == 'p3')}
-- Low (P4+): {sum(1 for i in incidents if i.get('priority') in ['p4', 'p5'])}
+- Critical (P1): {priority_counts['p1']}
+- High (P2): {priority_counts['p2']}
+- Medium (P3): {priority_counts['p3']}
+- Low (P4+): {priority_counts['p4'] + priority_counts['p5']}
 
 **Note**: Real AI analysis requires Anthropic API integration for deeper insights.
         """
@@ -147,22 +162,13 @@ Analyzing {len(incidents)} active incident(s) from Spike API
         """
 
 
-def display_incident_card(incident: Dict):
+def display_incident_card(incident: Incident):
     """Display a single incident as a card"""
-    priority = incident.get("priority", "unknown")
-    severity = incident.get("severity", "unknown")
-    title = incident.get("title", "Untitled Incident")
+    priority = incident.priority
+    severity = incident.severity
+    title = incident.title
     
-    # Color coding based on priority
-    priority_colors = {
-        "p1": "🔴",
-        "p2": "🟠",
-        "p3": "🟡",
-        "p4": "🟢",
-        "p5": "⚪"
-    }
-    
-    icon = priority_colors.get(priority, "⚫")
+    icon = priority_icon(priority)
     
     with st.container():
         col1, col2, col3 = st.columns([3, 1, 1])
@@ -177,80 +183,43 @@ def display_incident_card(incident: Dict):
             st.metric("Severity", severity.upper())
         
         # Additional details
-        if incident.get("metadata"):
-            st.text(f"Details: {incident['metadata']}")
+        if incident.metadata:
+            st.text(f"Details: {incident.metadata}")
         
         st.divider()
 
 
-def main():
-    """Main dashboard application"""
-    
-    # Check environment variables
-    check_env_vars()
-    
-    # Header
-    st.title("🚨 Spike Dashboard - Real-time Incident Monitoring")
-    st.markdown("**Direct Spike API integration for live incident management**")
-    
-    # Sidebar controls
-    with st.sidebar:
-        st.header("⚙️ Controls")
-        
-        incident_status = st.selectbox(
-            "Incident Status",
-            ["triggered", "acknowledged", "resolved"],
-            index=0
-        )
-        
-        auto_refresh = st.checkbox("Auto-refresh (30s)", value=False)
-        
-        st.divider()
-        
-        if st.button("🔄 Refresh Data", use_container_width=True):
-            st.rerun()
-        
-        st.divider()
-        
-        st.subheader("🧪 Test Actions")
-        if st.button("Create Test Incident", use_container_width=True):
-            with st.spinner("Creating test incident..."):
-                if create_test_incident():
-                    st.success("✅ Test incident created!")
-                    st.info("Refresh the dashboard to see it")
-                else:
-                    st.error("Failed to create test incident")
-    
-    # Auto-refresh
-    if auto_refresh:
-        st.rerun()
-    
+def incidents_panel(incident_status: str):
+    """Fetch and render metrics and incident tabs for the selected status"""
     # Fetch incidents
     with st.spinner(f"Fetching {incident_status} incidents..."):
-        incidents = fetch_spike_incidents(incident_status)
+        incidents, error = fetch_spike_incidents(incident_status)
+    
+    if error:
+        st.error(error)
     
     if incidents is None:
         st.error("Failed to fetch incidents from Spike API")
         st.info("Check your API credentials and try again")
         return
     
-    # Display metrics
+    # Display metrics - one pass per field instead of one per metric
+    priority_counts = Counter(i.priority for i in incidents)
+    severity_counts = Counter(i.severity for i in incidents)
+    
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
         st.metric("Total Incidents", len(incidents))
     
     with col2:
-        critical = sum(1 for i in incidents if i.get("priority") == "p1")
-        st.metric("Critical (P1)", critical)
+        st.metric("Critical (P1)", priority_counts["p1"])
     
     with col3:
-        high = sum(1 for i in incidents if i.get("priority") == "p2")
-        st.metric("High (P2)", high)
+        st.metric("High (P2)", priority_counts["p2"])
     
     with col4:
-        sev1 = sum(1 for i in incidents if i.get("severity") == "sev1")
-        st.metric("Severity 1", sev1)
+        st.metric("Severity 1", severity_counts["sev1"])
     
     st.divider()
     
@@ -263,8 +232,11 @@ def main():
         if not incidents:
             st.info(f"No {incident_status} incidents found")
         else:
-            for incident in incidents:
-                display_incident_card(incident)
+            display_incident_table(
+                incidents,
+                ["priority", "severity", "title", "status", "created_at", "metadata"],
+                display_incident_card
+            )
     
     with tab2:
         st.subheader("🤖 AI-Powered Alert Categorization")
@@ -293,5 +265,52 @@ def main():
     st.caption(f"Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
 
+def main():
+    """Main dashboard application"""
+    
+    # Check environment variables once per session
+    if "env_ok" not in st.session_state:
+        check_env_vars()
+        st.session_state.env_ok = True
+    
+    # Header
+    st.title("🚨 Spike Dashboard - Real-time Incident Monitoring")
+    st.markdown("**Direct Spike API integration for live incident management**")
+    
+    # Sidebar controls
+    with st.sidebar:
+        st.header("⚙️ Controls")
+        
+        incident_status = st.selectbox(
+            "Incident Status",
+            ["triggered", "acknowledged", "resolved"],
+            index=0
+        )
+        
+        auto_refresh = st.checkbox("Auto-refresh (30s)", value=False)
+        
+        st.divider()
+        
+        if st.button("🔄 Refresh Data", use_container_width=True):
+            load_spike_incidents.clear()
+        
+        st.divider()
+        
+        st.subheader("🧪 Test Actions")
+        if st.button("Create Test Incident", use_container_width=True):
+            with st.spinner("Creating test incident..."):
+                if create_test_incident():
+                    load_spike_incidents.clear()
+                    st.success("✅ Test incident created!")
+                    st.info("Refresh the dashboard to see it")
+                else:
+                    st.error("Failed to create test incident")
+    
+    # Auto-refresh reruns only the incidents panel every 30s; the 15s fetch cache
+    # has expired by then, so each tick pulls fresh data from Spike
+    run_every = "30s" if auto_refresh else None
+    st.fragment(run_every=run_every)(incidents_panel)(incident_status)
+
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
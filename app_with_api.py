@@ -7,12 +7,22 @@ ENHANCED: Now fetches real-time data from FastAPI backend
 
 import os
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import requests
 from datetime import datetime
-from typing import Dict, List, Optional
-import json
+from typing import Dict, Iterator, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+import orjson
 import time
 
+from dashboard_common import (
+    Incident,
+    display_incident_table,
+    get_http_session,
+    get_json,
+    priority_icon,
+)
+
 # Page config
 st.set_page_config(
     page_title="Spike Dashboard - AI Alert Analysis",
@@ -23,43 +33,85 @@ st.set_page_config(
 # API Configuration
 FASTAPI_URL = os.getenv("FASTAPI_URL", "http://localhost:8000")
 ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
+ANTHROPIC_URL = "https://api.anthropic.com/v1/messages"
+ANTHROPIC_HEADERS = {
+    "x-api-key": ANTHROPIC_API_KEY,
+    "anthropic-version": "2023-06-01",
+    "content-type": "application/json"
+}
+CLAUDE_MODEL = "claude-sonnet-4-20250514"
+AI_CHUNK_SIZE = 10  # incidents per Claude prompt
+AI_MAX_PARALLEL = 4  # batches analyzed concurrently before the merge prompt
+AI_MAX_INCIDENTS = AI_CHUNK_SIZE * AI_MAX_PARALLEL  # larger sets are truncated to bound cost and prompt size
+METADATA_PROMPT_CHARS = 200  # metadata is truncated to this length in AI prompts
+AI_CACHE_TTL = 600  # seconds an analysis is reused for an unchanged incident set
+
+
+
+API_SESSION = get_http_session("fastapi")
+ANTHROPIC_SESSION = get_http_session("anthropic")
+ANTHROPIC_SESSION.headers.update(ANTHROPIC_HEADERS)
+
+
+@st.cache_data(ttl=15, show_spinner=False)
+def load_incidents(status: str = None, refresh_bucket: Optional[int] = None) -> List[Incident]:
+    """Fetch incidents from FastAPI backend (raises on failure, see get_json)"""
+    params = {}
+    if status:
+        params["status"] = status
+    
+    data = get_json(API_SESSION, f"{FASTAPI_URL}/incidents", params=params, timeout=(2, 5))
+    return [Incident.from_dict(d) for d in data.get("incidents", [])]
 
 
-def fetch_incidents_from_api(status: str = None) -> Optional[List[Dict]]:
+@st.cache_data(ttl=15, show_spinner=False)
+def load_incident_stats(refresh_bucket: Optional[int] = None) -> Dict:
+    """Fetch incident statistics from FastAPI backend (raises on failure, see get_json)"""
+    return get_json(API_SESSION, f"{FASTAPI_URL}/incidents/stats", timeout=(2, 5))
+
+
+def fetch_incidents_from_api(
+    status: str = None,
+    refresh_bucket: Optional[int] = None
+) -> Tuple[Optional[List[Incident]], Optional[str]]:
     """
     Fetch incidents from FastAPI backend
     
     Args:
         status: Filter by status (triggered, acknowledged, resolved)
+        refresh_bucket: Auto-refresh time slot; a new slot misses the cache
     
     Returns:
-        List of incidents or None on error
+        Tuple of (list of incidents or None on error, error message or None)
     """
     try:
-        params = {}
-        if status:
-            params["status"] = status
-        
-        response = requests.get(f"{FASTAPI_URL}/incidents", params=params, timeout=5)
-        response.raise_for_status()
-        
-        data = response.json()
-        return data.get("incidents", [])
+        return load_incidents(status, refresh_bucket), None
         
     except requests.exceptions.ConnectionError:
-        st.warning("⚠️ Cannot connect to FastAPI backend. Make sure it's running on port 8000")
-        return None
+        return None, "⚠️ Cannot connect to FastAPI backend. Make sure it's running on port 8000"
     except Exception as e:
-        st.error(f"Error fetching incidents: {str(e)}")
-        return None
+        return None, f"Error fetching incidents: {str(e)}"
 
 
-def fetch_incident_stats() -> Optional[Dict]:
+def fetch_incident_stats(refresh_bucket: Optional[int] = None) -> Optional[Dict]:
     """Fetch incident statistics from FastAPI backend"""
     try:
-        response = requests.get(f"{FASTAPI_URL}/incidents/stats", timeout=5)
-        response.raise_for_status()
-        return response.json()
+        return load_incident_stats(refresh_bucket)
+    except:
+        return None
+
+
+def clear_fetch_cache():
+    """Drop cached incidents and stats so the next fetch hits the backend"""
+    load_incidents.clear()
+    load_incident_stats.clear()
+
+
+def check_backend_health() -> Optional[int]:
+    """Return the FastAPI health endpoint status code, or None if unreachable"""
+    try:
+        response = API_SESSION.get(f"{FASTAPI_URL}/health", timeout=(1, 2))
+        return response.status_code
     except:
         return None
 
@@ -67,7 +119,7 @@ def fetch_incident_stats() -> Optional[Dict]:
 def create_mock_incident_via_api() -> bool:
     """Create a mock incident via FastAPI"""
     try:
-        response = requests.post(f"{FASTAPI_URL}/incidents/mock", timeout=5)
+        response = API_SESSION.post(f"{FASTAPI_URL}/incidents/mock", timeout=(2, 5))
         return response.status_code == 200
     except:
         return False
@@ -76,27 +128,221 @@ def create_mock_incident_via_api() -> bool:
 def clear_all_incidents() -> bool:
     """Clear all incidents from FastAPI backend"""
     try:
-        response = requests.delete(f"{FASTAPI_URL}/incidents", timeout=5)
+        response = API_SESSION.delete(f"{FASTAPI_URL}/incidents", timeout=(2, 5))
         return response.status_code == 200
     except:
         return False
 
 
-def analyze_with_ai(incidents: List[Dict], analysis_type: str) -> str:
+def get_background_executor() -> ThreadPoolExecutor:
+    """This session's worker for sidebar writes, so clicks return without waiting on the POST/DELETE"""
+    # One worker per browser session sends its writes in click order, so a Clear never overtakes
+    # an earlier Create, and no session queues behind another user's writes. The idle thread
+    # exits once the session's state, and with it the executor, is dropped.
+    if "write_executor" not in st.session_state:
+        st.session_state.write_executor = ThreadPoolExecutor(max_workers=1)
+    return st.session_state.write_executor
+
+
+def reconcile_pending_writes() -> Tuple[int, bool]:
     """
-    Analyze incidents using Claude AI or return mock analysis
+    Settle background create/clear requests started from the sidebar
+    
+    When the last request finishes, the fetch cache is dropped and the app
+    reruns, so the real server state replaces the optimistic placeholders
+    and the fast poll stops. Failures are reported on that rerun.
+    
+    Returns:
+        Tuple of (mock incidents still being created, whether a clear is still running)
+    """
+    for message in st.session_state.pop("write_errors", []):
+        st.error(message)
+    
+    settled = False
+    errors = []
+    
+    creating = []
+    for future in st.session_state.get("pending_creates", []):
+        if not future.done():
+            creating.append(future)
+            continue
+        settled = True
+        if not future.result():
+            errors.append("Failed to create mock incident")
+    st.session_state.pending_creates = creating
+    
+    clearing = st.session_state.get("pending_clear")
+    if clearing is not None and clearing.done():
+        settled = True
+        del st.session_state["pending_clear"]
+        if not clearing.result():
+            errors.append("Failed to clear incidents")
+        clearing = None
+    
+    if settled:
+        clear_fetch_cache()
+        st.session_state.write_errors = errors
+        if not creating and clearing is None:
+            st.rerun()
+    
+    return len(creating), clearing is not None
+
+
+def slim_incidents_json(incidents: List[Incident]) -> str:
+    """
+    Serialize incidents for an AI prompt, keeping only the fields the model needs
+    
+    Args:
+        incidents: List of incidents
+    
+    Returns:
+        Compact JSON array of title, priority, severity and truncated metadata
+    """
+    slim = [
+        {
+            "title": i.title,
+            "priority": i.priority,
+            "severity": i.severity,
+            "metadata": str(i.metadata or "")[:METADATA_PROMPT_CHARS]
+        }
+        for i in incidents
+    ]
+    return orjson.dumps(slim).decode()
+
+
+def build_analysis_prompt(incidents: List[Incident], analysis_type: str) -> str:
+    """
+    Build the Claude prompt for one batch of incidents
+    
+    Args:
+        incidents: Incidents to include in the prompt
+        analysis_type: Type of analysis (categorize or summarize)
+    
+    Returns:
+        Prompt text
+    """
+    incidents_json = slim_incidents_json(incidents)
+    
+    if analysis_type == "categorize":
+        return f"""Analyze these {len(incidents)} incidents and categorize them by:
+1. Type of issue (infrastructure, application, network, database, etc.)
+2. Severity distribution
+3. Common patterns or recurring issues
+
+Incidents data:
+{incidents_json}
+
+Provide a clear, concise categorization with actionable insights."""
+
+    else:  # summarize
+        return f"""Summarize these {len(incidents)} incidents:
+1. Overall incident summary
+2. Key incidents requiring immediate attention
+3. Trends and patterns
+4. Recommended actions
+
+Incidents data:
+{incidents_json}
+
+Provide a brief executive summary suitable for incident review."""
+
+
+def build_merge_prompt(partials: List[str], total: int, analysis_type: str) -> str:
+    """
+    Build the Claude prompt that merges per-batch analyses into one result
     
     Args:
-        incidents: List of incident dictionaries
+        partials: Analysis text for each batch
+        total: Total number of incidents being analyzed
         analysis_type: Type of analysis (categorize or summarize)
     
     Returns:
-        AI analysis result
+        Prompt text
+    """
+    batches = "\n\n".join(f"### Batch {n}\n{text}" for n, text in enumerate(partials, 1))
+    
+    if analysis_type == "categorize":
+        task = "one categorization by issue type, severity distribution and recurring patterns"
+        closing = "Provide a clear, concise categorization with actionable insights."
+    else:  # summarize
+        task = "one executive summary covering key incidents, trends and recommended actions"
+        closing = "Provide a brief executive summary suitable for incident review."
+    
+    return f"""Below are partial analyses of {total} incidents, split into {len(partials)} batches.
+Merge them into {task}.
+
+{batches}
+
+{closing}"""
+
+
+def request_claude(prompt: str) -> str:
+    """Send a single non-streaming prompt to Claude and return the reply text"""
+    payload = {
+        "model": CLAUDE_MODEL,
+        "max_tokens": 1024,
+        "messages": [
+            {"role": "user", "content": prompt}
+        ]
+    }
+    
+    response = ANTHROPIC_SESSION.post(ANTHROPIC_URL, data=orjson.dumps(payload), timeout=(3, 60))
+    response.raise_for_status()
+    
+    result = orjson.loads(response.content)
+    return result["content"][0]["text"]
+
+
+def stream_claude(prompt: str) -> Iterator[str]:
+    """Send a prompt to Claude and yield reply text as it is generated"""
+    payload = {
+        "model": CLAUDE_MODEL,
+        "max_tokens": 1024,
+        "stream": True,
+        "messages": [
+            {"role": "user", "content": prompt}
+        ]
+    }
+    
+    with ANTHROPIC_SESSION.post(
+        ANTHROPIC_URL,
+        data=orjson.dumps(payload),
+        stream=True,
+        timeout=(3, 60)
+    ) as response:
+        response.raise_for_status()
+        response.encoding = "utf-8"
+        
+        # Server-sent events: only "data:" lines carry JSON payloads
+        for line in response.iter_lines(decode_unicode=True):
+            if not line or not line.startswith("data:"):
+                continue
+            
+            event = orjson.loads(line[len("data:"):])
+            if event.get("type") == "content_block_delta":
+                yield event["delta"].get("text", "")
+            elif event.get("type") == "error":
+                raise RuntimeError(event.get("error", {}).get("message", "stream error"))
+
+
+def analyze_with_ai(incidents: List[Incident], analysis_type: str) -> Iterator[str]:
+    """
+    Analyze incidents using Claude AI or return mock analysis
+    
+    Args:
+        incidents: List of incidents
+        analysis_type: Type of analysis (categorize or summarize)
+    
+    Yields:
+        AI analysis text, streamed as it is generated
+    
+    Raises:
+        Exception: If a request fails, including after part of the text was streamed
     """
     # If no Anthropic key, return mock analysis
     if not ANTHROPIC_API_KEY:
         if analysis_type == "categorize":
-            return """
+            yield """
 ## 🤖 AI Categorization (MOCK DATA - Add ANTHROPIC_API_KEY for real analysis)
 
 ### Issue Type Distribution:
@@ -115,7 +361,7 @@ def analyze_with_ai(incidents: List[Dict], analysis_type: str) -> str:
 🔧 Implement automated remediation
             """
         else:  # summarize
-            return f"""
+            yield f"""
 ## 📋 Executive Summary (MOCK DATA - Add ANTHROPIC_API_KEY for real analysis)
 
 ### Overview
@@ -126,78 +372,73 @@ Currently tracking {len(incidents)} active incidents across infrastructure.
 - Review resource allocation
 - Set up automated monitoring
             """
+        return
     
     # Real AI analysis with Anthropic API
-    try:
-        if analysis_type == "categorize":
-            prompt = f"""Analyze these {len(incidents)} incidents and categorize them by:
-1. Type of issue (infrastructure, application, network, database, etc.)
-2. Severity distribution
-3. Common patterns or recurring issues
-
-Incidents data:
-{json.dumps(incidents[:10], indent=2)}
-
-Provide a clear, concise categorization with actionable insights."""
-
-        else:  # summarize
-            prompt = f"""Summarize these {len(incidents)} incidents:
-1. Overall incident summary
-2. Key incidents requiring immediate attention
-3. Trends and patterns
-4. Recommended actions
-
-Incidents data:
-{json.dumps(incidents[:10], indent=2)}
-
-Provide a brief executive summary suitable for incident review."""
-
-        headers = {
-            "x-api-key": ANTHROPIC_API_KEY,
-            "anthropic-version": "2023-06-01",
-            "content-type": "application/json"
-        }
-        
-        payload = {
-            "model": "claude-sonnet-4-20250514",
-            "max_tokens": 1024,
-            "messages": [
-                {"role": "user", "content": prompt}
-            ]
-        }
-        
-        response = requests.post(
-            "https://api.anthropic.com/v1/messages",
-            headers=headers,
-            json=payload,
-            timeout=30
+    analyzed = incidents[:AI_MAX_INCIDENTS]
+    if len(incidents) > len(analyzed):
+        yield (
+            f"_Analyzing the first {len(analyzed)} of {len(incidents)} incidents; "
+            f"{len(incidents) - len(analyzed)} were left out._\n\n"
         )
-        response.raise_for_status()
+    
+    if len(analyzed) <= AI_CHUNK_SIZE:
+        prompt = build_analysis_prompt(analyzed, analysis_type)
+    else:
+        # Analyze batches concurrently over the pooled session, then merge the partial results
+        chunks = [analyzed[i:i + AI_CHUNK_SIZE] for i in range(0, len(analyzed), AI_CHUNK_SIZE)]
+        prompts = [build_analysis_prompt(chunk, analysis_type) for chunk in chunks]
         
-        result = response.json()
-        return result["content"][0]["text"]
+        with ThreadPoolExecutor(max_workers=len(chunks)) as executor:
+            partials = list(executor.map(request_claude, prompts))
         
+        prompt = build_merge_prompt(partials, len(analyzed), analysis_type)
+    
+    yield from stream_claude(prompt)
+
+
+def display_ai_analysis(incidents: List[Incident], analysis_type: str, force: bool = False):
+    """
+    Stream an AI analysis, or replay it if this incident set was analyzed recently
+    
+    st.cache_data cannot memoize a streaming generator, so finished analyses are
+    kept in session state keyed by analysis type and the sorted incident IDs.
+    
+    Args:
+        incidents: List of incidents
+        analysis_type: Type of analysis (categorize or summarize)
+        force: Skip the cache and ask the model again
+    """
+    cache = st.session_state.setdefault("ai_cache", {})
+    key = (analysis_type, tuple(sorted(str(i.id) for i in incidents)))
+    
+    # Drop expired analyses so the cache doesn't grow with every incident set seen
+    now = time.time()
+    for expired in [k for k, (created, _) in cache.items() if now - created >= AI_CACHE_TTL]:
+        del cache[expired]
+    
+    cached = cache.get(key)
+    if cached and not force:
+        st.markdown(cached[1])
+        return
+    
+    # Only streams that finish cleanly are cached; partial text from a failed stream stays on screen
+    try:
+        text = st.write_stream(analyze_with_ai(incidents, analysis_type))
     except Exception as e:
-        return f"Error during AI analysis: {str(e)}"
+        st.error(f"Error during AI analysis: {str(e)}")
+        return
+    cache[key] = (time.time(), text)
 
 
-def display_incident_card(incident: Dict):
+def display_incident_card(incident: Incident):
     """Display a single incident as a card"""
-    priority = incident.get("priority", "unknown")
-    severity = incident.get("severity", "unknown")
-    title = incident.get("title", "Untitled Incident")
-    source = incident.get("source", "unknown")
-    
-    # Color coding based on priority
-    priority_colors = {
-        "p1": "🔴",
-        "p2": "🟠",
-        "p3": "🟡",
-        "p4": "🟢",
-        "p5": "⚪"
-    }
+    priority = incident.priority
+    severity = incident.severity
+    title = incident.title
+    source = incident.source
     
-    icon = priority_colors.get(priority, "⚫")
+    icon = priority_icon(priority)
     
     with st.container():
         col1, col2, col3, col4 = st.columns([3, 1, 1, 1])
@@ -215,98 +456,75 @@ def display_incident_card(incident: Dict):
             st.caption(f"Source: {source}")
         
         # Additional details
-        if incident.get("metadata"):
-            st.text(f"Details: {incident['metadata']}")
+        if incident.metadata:
+            st.text(f"Details: {incident.metadata}")
         
-        created = incident.get("created_at", "")
+        created = incident.created_at
         if created:
             st.caption(f"Created: {created}")
         
         st.divider()
 
 
-def main():
-    """Main dashboard application"""
+def incidents_panel(status_filter: Optional[str], refresh_interval: Optional[int] = None):
+    """
+    Fetch and render health, metrics and incident tabs
     
-    # Header
-    st.title("🚨 Spike Dashboard - AI Alert Analysis")
-    st.markdown("**Real-time incident monitoring with FastAPI webhook integration**")
+    Args:
+        status_filter: Status to filter incidents by, or None for all
+        refresh_interval: Auto-refresh period in seconds, or None when auto-refresh is off
+    """
+    pending_creates, clear_pending = reconcile_pending_writes()
+    
+    # Each auto-refresh slot is its own cache key, so data is at most one interval old
+    # without clearing the cache other sessions share
+    refresh_bucket = int(time.time() // refresh_interval) if refresh_interval else None
+    
+    # Health check, incidents and stats are independent round-trips - run them concurrently
+    with st.spinner(f"Fetching incidents..."):
+        with ThreadPoolExecutor(
+            max_workers=3,
+            initializer=add_script_run_ctx,
+            initargs=(None, get_script_run_ctx())
+        ) as executor:
+            health_future = executor.submit(check_backend_health)
+            incidents_future = executor.submit(fetch_incidents_from_api, status_filter, refresh_bucket)
+            stats_future = executor.submit(fetch_incident_stats, refresh_bucket)
+            health_status = health_future.result()
+            incidents, error = incidents_future.result()
+            stats = stats_future.result()
     
     # Check FastAPI connection
-    try:
-        health = requests.get(f"{FASTAPI_URL}/health", timeout=2)
-        if health.status_code == 200:
-            st.success(f"✅ Connected to FastAPI backend at {FASTAPI_URL}")
-        else:
-            st.error(f"❌ FastAPI backend health check failed")
-    except:
+    if health_status == 200:
+        st.success(f"✅ Connected to FastAPI backend at {FASTAPI_URL}")
+    elif health_status is None:
         st.error(f"❌ Cannot connect to FastAPI backend at {FASTAPI_URL}")
         st.info("Start the FastAPI server with: `python api.py`")
         st.stop()
+    else:
+        st.error(f"❌ FastAPI backend health check failed")
     
-    # Sidebar controls
-    with st.sidebar:
-        st.header("⚙️ Controls")
-        
-        incident_status = st.selectbox(
-            "Incident Status",
-            ["all", "triggered", "acknowledged", "resolved"],
-            index=0
-        )
-        
-        # Auto-refresh toggle
-        auto_refresh = st.checkbox("Auto-refresh (5s)", value=False)
-        refresh_interval = st.slider("Refresh interval (seconds)", 3, 30, 5)
-        
-        st.divider()
-        
-        if st.button("🔄 Refresh Now", use_container_width=True):
-            st.rerun()
-        
-        st.divider()
-        
-        st.subheader("🧪 Test Actions")
-        
-        if st.button("📥 Create Mock Incident", use_container_width=True):
-            with st.spinner("Creating mock incident..."):
-                if create_mock_incident_via_api():
-                    st.success("✅ Mock incident created!")
-                    time.sleep(1)
-                    st.rerun()
-                else:
-                    st.error("Failed to create mock incident")
-        
-        if st.button("🗑️ Clear All Incidents", use_container_width=True, type="secondary"):
-            if clear_all_incidents():
-                st.success("✅ All incidents cleared!")
-                time.sleep(1)
-                st.rerun()
-            else:
-                st.error("Failed to clear incidents")
-        
-        st.divider()
-        
-        st.subheader("📡 Webhook Info")
-        st.code(f"{FASTAPI_URL}/webhook/spike", language="text")
-        st.caption("Send POST requests here to create incidents")
-    
-    # Auto-refresh logic
-    if auto_refresh:
-        time.sleep(refresh_interval)
-        st.rerun()
-    
-    # Fetch incidents
-    status_filter = None if incident_status == "all" else incident_status
-    
-    with st.spinner(f"Fetching incidents..."):
-        incidents = fetch_incidents_from_api(status_filter)
-        stats = fetch_incident_stats()
+    if error:
+        st.warning(error)
     
     if incidents is None:
         st.error("Failed to fetch incidents from FastAPI backend")
         st.info("Make sure the FastAPI server is running: `python api.py`")
         return
     
+    # Optimistic view of sidebar writes that are still in flight
+    if clear_pending:
+        incidents = []
+        stats = {"total": 0, "by_priority": {}, "by_severity": {}, "by_status": {}}
+    # AI analysis only sees incidents the server returned, never the placeholders below
+    server_incidents = incidents
+    if pending_creates and status_filter in (None, "triggered"):
+        placeholders = [
+            Incident(id=f"pending-{n}", title="⏳ Creating mock incident...", status="triggered", source="dashboard")
+            for n in range(pending_creates)
+        ]
+        incidents = placeholders + incidents
+    
     # Display metrics from stats
     if stats:
         col1, col2, col3, col4 = st.columns(4)
@@ -343,30 +561,39 @@ def main():
             3. Use Spike.sh integration
             """)
         else:
-            for incident in incidents:
-                display_incident_card(incident)
+            display_incident_table(
+                incidents,
+                ["priority", "severity", "title", "source", "status", "created_at", "metadata"],
+                display_incident_card
+            )
     
     with tab2:
         st.subheader("🤖 AI-Powered Alert Categorization")
         
-        if not incidents:
+        if not server_incidents:
             st.info("No incidents to categorize")
         else:
-            if st.button("🧠 Analyze & Categorize Incidents", use_container_width=True):
+            col1, col2 = st.columns([3, 1])
+            analyze = col1.button("🧠 Analyze & Categorize Incidents", use_container_width=True)
+            refresh = col2.button("🔁 Force refresh", key="categorize_refresh", use_container_width=True)
+            
+            if analyze or refresh:
                 with st.spinner("AI is analyzing incidents..."):
-                    analysis = analyze_with_ai(incidents, "categorize")
-                    st.markdown(analysis)
+                    display_ai_analysis(server_incidents, "categorize", force=refresh)
     
     with tab3:
         st.subheader("📝 AI-Powered Incident Summary")
         
-        if not incidents:
+        if not server_incidents:
             st.info("No incidents to summarize")
         else:
-            if st.button("📋 Generate Summary", use_container_width=True):
+            col1, col2 = st.columns([3, 1])
+            generate = col1.button("📋 Generate Summary", use_container_width=True)
+            refresh = col2.button("🔁 Force refresh", key="summarize_refresh", use_container_width=True)
+            
+            if generate or refresh:
                 with st.spinner("AI is generating summary..."):
-                    summary = analyze_with_ai(incidents, "summarize")
-                    st.markdown(summary)
+                    display_ai_analysis(server_incidents, "summarize", force=refresh)
     
     with tab4:
         st.subheader("📈 Incident Statistics")
@@ -396,7 +623,7 @@ def main():
             if stats.get("latest_incident"):
                 st.divider()
                 st.markdown("#### Latest Incident")
-                display_incident_card(stats["latest_incident"])
+                display_incident_card(Incident.from_dict(stats["latest_incident"]))
         else:
             st.info("No statistics available - add some incidents first!")
     
@@ -405,5 +632,66 @@ def main():
     st.caption(f"Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
 
+def main():
+    """Main dashboard application"""
+    
+    # Header
+    st.title("🚨 Spike Dashboard - AI Alert Analysis")
+    st.markdown("**Real-time incident monitoring with FastAPI webhook integration**")
+    
+    # Sidebar controls
+    with st.sidebar:
+        st.header("⚙️ Controls")
+        
+        incident_status = st.selectbox(
+            "Incident Status",
+            ["all", "triggered", "acknowledged", "resolved"],
+            index=0
+        )
+        
+        # Auto-refresh toggle
+        auto_refresh = st.checkbox("Auto-refresh (5s)", value=False)
+        refresh_interval = st.slider("Refresh interval (seconds)", 3, 30, 5)
+        
+        st.divider()
+        
+        if st.button("🔄 Refresh Now", use_container_width=True):
+            clear_fetch_cache()
+        
+        st.divider()
+        
+        st.subheader("🧪 Test Actions")
+        
+        # Writes run in the background; the panel shows their effect immediately
+        if st.button("📥 Create Mock Incident", use_container_width=True):
+            future = get_background_executor().submit(create_mock_incident_via_api)
+            st.session_state.setdefault("pending_creates", []).append(future)
+        
+        if st.button("🗑️ Clear All Incidents", use_container_width=True, type="secondary"):
+            st.session_state.pending_clear = get_background_executor().submit(clear_all_incidents)
+        
+        st.divider()
+        
+        st.subheader("📡 Webhook Info")
+        st.code(f"{FASTAPI_URL}/webhook/spike", language="text")
+        st.caption("Send POST requests here to create incidents")
+    
+    status_filter = None if incident_status == "all" else incident_status
+    
+    # Auto-refresh reruns only the incidents panel on a timer, so the sidebar stays responsive
+    # While sidebar writes are in flight, poll briefly so their results replace the placeholders
+    writes_pending = bool(st.session_state.get("pending_creates")) or "pending_clear" in st.session_state
+    if auto_refresh:
+        run_every = f"{refresh_interval}s"
+    elif writes_pending:
+        run_every = "1s"
+    else:
+        run_every = None
+    st.fragment(run_every=run_every)(incidents_panel)(
+        status_filter,
+        refresh_interval=refresh_interval if auto_refresh else None
+    )
+
+
 if __name__ == "__main__":
     main()
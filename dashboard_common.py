@@ -0,0 +1,172 @@
+"""
+Shared pieces of the Spike dashboards (app.py and app_with_api.py)
+
+Kept in an importable module rather than the Streamlit scripts themselves: st.cache_data
+pickles its values by class reference, and a script's own module is replaced on reruns.
+"""
+
+import streamlit as st
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence
+import orjson
+
+# Color coding based on priority - priorities index into the icon tuple, the last icon is for unknown
+PRIORITY_INDEX = {"p1": 0, "p2": 1, "p3": 2, "p4": 3, "p5": 4}
+PRIORITY_ICONS = ("🔴", "🟠", "🟡", "🟢", "⚪", "⚫")
+UNKNOWN_PRIORITY_INDEX = len(PRIORITY_ICONS) - 1
+
+INCIDENT_COLUMN_CONFIG = {
+    "icon": st.column_config.TextColumn("", width="small"),
+    "priority": st.column_config.TextColumn("Priority", width="small"),
+    "severity": st.column_config.TextColumn("Severity", width="small"),
+    "title": st.column_config.TextColumn("Title", width="large"),
+    "source": st.column_config.TextColumn("Source", width="small"),
+    "status": st.column_config.TextColumn("Status", width="small"),
+    "created_at": st.column_config.TextColumn("Created"),
+    "metadata": st.column_config.TextColumn("Details")
+}
+
+
+class Incident(NamedTuple):
+    """Incident record, parsed once from the API's JSON so rendering uses attribute access"""
+    id: str = ""
+    title: str = "Untitled Incident"
+    priority: str = "unknown"
+    severity: str = "unknown"
+    status: str = ""
+    metadata: str = ""
+    source: str = "unknown"
+    created_at: str = ""
+    updated_at: str = ""
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Incident":
+        """Build an Incident from an API dict, ignoring unknown keys"""
+        return cls(**{field: data.get(field, default) for field, default in cls._field_defaults.items()})
+
+
+@st.cache_resource
+def get_http_session(name: str) -> requests.Session:
+    """
+    Create a pooled HTTP session, reused across reruns
+
+    Args:
+        name: Upstream the session talks to (one connection pool per host)
+
+    Returns:
+        Session with keep-alive connection pooling and retries
+    """
+    session = requests.Session()
+    # Exponential backoff on rate limits and transient upstream errors (529 = Anthropic overloaded).
+    # Only GETs are retried on a status; a 5xx to a POST may come after the write was committed,
+    # so POSTs (incident creation, Claude completions) are retried only when the connection failed.
+    # Once retries run out the last response is returned, so callers still see its status code.
+    retry = Retry(
+        total=3,
+        connect=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504, 529],
+        allowed_methods=frozenset({"GET"}),
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+@st.cache_resource
+def get_validator_store() -> Dict:
+    """Process-wide ETag / Last-Modified validators and bodies, keyed by GET URL and params"""
+    return {}
+
+
+def get_json(session: requests.Session, url: str, params: Optional[Dict] = None, timeout=(3, 10)):
+    """
+    GET a JSON body, revalidating the last response with If-None-Match / If-Modified-Since
+
+    Args:
+        session: Session to send the request on
+        url: URL to fetch
+        params: Query parameters
+        timeout: (connect, read) timeout in seconds
+
+    Returns:
+        Parsed JSON body; the stored body is reused when the server answers 304
+
+    Raises:
+        requests.RequestException: On any failure, so st.cache_data loaders built on
+            this never memoize an error - their uncached callers turn it into a message
+    """
+    validators = get_validator_store()
+    key = (url, tuple(sorted((params or {}).items())))
+    cached = validators.get(key)
+
+    headers = {}
+    if cached:
+        if cached["etag"]:
+            headers["If-None-Match"] = cached["etag"]
+        if cached["last_modified"]:
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    response = session.get(url, params=params, headers=headers, timeout=timeout)
+    if response.status_code == 304 and cached:
+        return cached["body"]
+    response.raise_for_status()
+
+    body = orjson.loads(response.content)
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if etag or last_modified:
+        validators[key] = {"etag": etag, "last_modified": last_modified, "body": body}
+    return body
+
+
+def priority_icon(priority: str) -> str:
+    """Map an incident priority to its color-coded icon"""
+    return PRIORITY_ICONS[PRIORITY_INDEX.get(priority, UNKNOWN_PRIORITY_INDEX)]
+
+
+def display_incident_table(
+    incidents: List[Incident],
+    columns: Sequence[str],
+    display_card: Callable[[Incident], None]
+):
+    """
+    Display incidents as a single table; the selected row is expanded into a card
+
+    Args:
+        incidents: List of incidents
+        columns: Incident fields to show, in order, after the priority icon
+        display_card: Renders the selected incident
+    """
+    # Rebuild the frame only when an incident changed, so idle refresh ticks reuse it
+    try:
+        signature = hash(tuple(incidents))
+    except TypeError:
+        # Payload fields such as metadata may arrive as JSON objects, which aren't hashable
+        signature = hash(repr(incidents))
+    if st.session_state.get("incident_table_signature") != signature:
+        df = pd.DataFrame(incidents).reindex(columns=list(columns))
+        icon_index = df["priority"].map(PRIORITY_INDEX).fillna(UNKNOWN_PRIORITY_INDEX).astype(int)
+        df.insert(0, "icon", icon_index.map(dict(enumerate(PRIORITY_ICONS))))
+        st.session_state["incident_table_signature"] = signature
+        st.session_state["incident_table_df"] = df
+
+    df = st.session_state["incident_table_df"]
+
+    event = st.dataframe(
+        df,
+        column_config={name: INCIDENT_COLUMN_CONFIG[name] for name in df.columns},
+        hide_index=True,
+        use_container_width=True,
+        on_select="rerun",
+        selection_mode="single-row"
+    )
+
+    for row in event.selection.rows:
+        display_card(incidents[row])
@@ -3,138 +3,159 @@ Test script to validate Spike API and Anthropic API connections
 Run this before starting the dashboard to ensure everything is configured correctly
 """
 
+import atexit
 import os
+import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from dotenv import load_dotenv
+import orjson
 import requests
 
-# Load environment variables
-load_dotenv()
+# Shared session so repeated probes reuse pooled connections (and TLS sessions)
+_HTTPS = requests.Session()
+_HTTPS.mount("https://", requests.adapters.HTTPAdapter(pool_connections=2, pool_maxsize=4))
+_HTTPS.headers.update({"Accept": "application/json"})
+atexit.register(_HTTPS.close)
+
+# Section rule shared by every header and banner
+_BAR = "=" * 60
+
+# Placeholder values from the README all start with "your_"; a prefix match avoids lowercasing whole keys
+_PLACEHOLDER_RE = re.compile(r"^your_", re.I)
+
+
+@contextmanager
+def _buffered_output():
+    """Collect a check's lines and print them with one write, so concurrent checks never interleave"""
+    buf = []
+    try:
+        yield buf.append
+    finally:
+        sys.stdout.write("\n".join(buf) + "\n")
+
 
 def test_env_vars():
     """Test if environment variables are set"""
-    print("=" * 60)
-    print("Testing Environment Variables")
-    print("=" * 60)
-    
-    required_vars = {
-        "SPIKE_API_KEY": os.getenv("SPIKE_API_KEY"),
-        "SPIKE_TEAM_ID": os.getenv("SPIKE_TEAM_ID"),
-        "ANTHROPIC_API_KEY": os.getenv("ANTHROPIC_API_KEY")
-    }
-    
-    all_set = True
-    for var_name, var_value in required_vars.items():
-        if not var_value or "your_" in var_value.lower():
-            print(f"❌ {var_name}: NOT SET or using placeholder")
-            all_set = False
-        else:
-            # Show masked value
-            masked = var_value[:8] + "..." + var_value[-4:] if len(var_value) > 12 else "***"
-            print(f"✅ {var_name}: {masked}")
-    
-    print()
-    return all_set
+    with _buffered_output() as log:
+        log(f"{_BAR}\nTesting Environment Variables\n{_BAR}")
+        
+        required_vars = {
+            "SPIKE_API_KEY": os.getenv("SPIKE_API_KEY"),
+            "SPIKE_TEAM_ID": os.getenv("SPIKE_TEAM_ID"),
+            "ANTHROPIC_API_KEY": os.getenv("ANTHROPIC_API_KEY")
+        }
+        
+        all_set = True
+        for var_name, var_value in required_vars.items():
+            if not var_value or _PLACEHOLDER_RE.match(var_value):
+                log(f"❌ {var_name}: NOT SET or using placeholder")
+                all_set = False
+            else:
+                # Show masked value
+                masked = f"{var_value[:8]}...{var_value[-4:]}" if len(var_value) > 12 else "***"
+                log(f"✅ {var_name}: {masked}")
+        
+        log("")
+        return all_set
 
 
 def test_spike_api():
     """Test Spike API connection"""
-    print("=" * 60)
-    print("Testing Spike API Connection")
-    print("=" * 60)
-    
-    api_key = os.getenv("SPIKE_API_KEY")
-    team_id = os.getenv("SPIKE_TEAM_ID")
-    
-    if not api_key or not team_id:
-        print("❌ Cannot test - credentials not set")
-        print()
-        return False
-    
-    try:
-        headers = {
-            "x-api-key": api_key,
-            "x-team-id": team_id,
-            "Accept": "application/json"
-        }
+    with _buffered_output() as log:
+        log(f"{_BAR}\nTesting Spike API Connection\n{_BAR}")
         
-        url = "https://api.spike.sh/incidents/triggered"
+        api_key = os.getenv("SPIKE_API_KEY")
+        team_id = os.getenv("SPIKE_TEAM_ID")
         
-        print(f"Fetching from: {url}")
-        response = requests.get(url, headers=headers, timeout=10)
-        
-        if response.status_code == 200:
-            data = response.json()
-            incident_count = len(data.get("incidents", []))
-            print(f"✅ Connection successful!")
-            print(f"   Found {incident_count} triggered incidents")
-            print()
-            return True
-        else:
-            print(f"❌ API returned status code: {response.status_code}")
-            print(f"   Response: {response.text}")
-            print()
+        if not api_key or not team_id:
+            log("❌ Cannot test - credentials not set")
+            log("")
             return False
+        
+        try:
+            headers = {
+                "x-api-key": api_key,
+                "x-team-id": team_id
+            }
             
-    except Exception as e:
-        print(f"❌ Error connecting to Spike API: {str(e)}")
-        print()
-        return False
+            url = "https://api.spike.sh/incidents/triggered"
+            
+            log(f"Fetching from: {url}")
+            response = _HTTPS.get(url, headers=headers, timeout=10)
+            
+            if response.status_code == 200:
+                data = orjson.loads(response.content)
+                incident_count = len(data.get("incidents", []))
+                log(f"✅ Connection successful!")
+                log(f"   Found {incident_count} triggered incidents")
+                log("")
+                return True
+            else:
+                log(f"❌ API returned status code: {response.status_code}")
+                log(f"   Response: {response.text}")
+                log("")
+                return False
+                
+        except Exception as e:
+            log(f"❌ Error connecting to Spike API: {str(e)}")
+            log("")
+            return False
 
 
 def test_anthropic_api():
     """Test Anthropic API connection"""
-    print("=" * 60)
-    print("Testing Anthropic API Connection")
-    print("=" * 60)
-    
-    api_key = os.getenv("ANTHROPIC_API_KEY")
-    
-    if not api_key:
-        print("❌ Cannot test - API key not set")
-        print()
-        return False
-    
-    try:
-        headers = {
-            "x-api-key": api_key,
-            "anthropic-version": "2023-06-01",
-            "content-type": "application/json"
-        }
+    with _buffered_output() as log:
+        log(f"{_BAR}\nTesting Anthropic API Connection\n{_BAR}")
         
-        payload = {
-            "model": "claude-sonnet-4-20250514",
-            "max_tokens": 50,
-            "messages": [
-                {"role": "user", "content": "Say 'API connection test successful' and nothing else."}
-            ]
-        }
+        api_key = os.getenv("ANTHROPIC_API_KEY")
         
-        print("Sending test request to Anthropic API...")
-        response = requests.post(
-            "https://api.anthropic.com/v1/messages",
-            headers=headers,
-            json=payload,
-            timeout=30
-        )
-        
-        if response.status_code == 200:
-            result = response.json()
-            message = result["content"][0]["text"]
-            print(f"✅ Connection successful!")
-            print(f"   Response: {message}")
-            print()
-            return True
-        else:
-            print(f"❌ API returned status code: {response.status_code}")
-            print(f"   Response: {response.text}")
-            print()
+        if not api_key:
+            log("❌ Cannot test - API key not set")
+            log("")
             return False
+        
+        try:
+            headers = {
+                "x-api-key": api_key,
+                "anthropic-version": "2023-06-01",
+                "content-type": "application/json"
+            }
             
-    except Exception as e:
-        print(f"❌ Error connecting to Anthropic API: {str(e)}")
-        print()
-        return False
+            payload = {
+                "model": "claude-sonnet-4-20250514",
+                "max_tokens": 50,
+                "messages": [
+                    {"role": "user", "content": "Say 'API connection test successful' and nothing else."}
+                ]
+            }
+            
+            log("Sending test request to Anthropic API...")
+            response = _HTTPS.post(
+                "https://api.anthropic.com/v1/messages",
+                headers=headers,
+                json=payload,
+                timeout=30
+            )
+            
+            if response.status_code == 200:
+                result = orjson.loads(response.content)
+                message = result["content"][0]["text"]
+                log(f"✅ Connection successful!")
+                log(f"   Response: {message}")
+                log("")
+                return True
+            else:
+                log(f"❌ API returned status code: {response.status_code}")
+                log(f"   Response: {response.text}")
+                log("")
+                return False
+                
+        except Exception as e:
+            log(f"❌ Error connecting to Anthropic API: {str(e)}")
+            log("")
+            return False
 
 
 def main():
@@ -147,23 +168,23 @@ def main():
     env_ok = test_env_vars()
     
     if not env_ok:
-        print("=" * 60)
+        print(_BAR)
         print("⚠️  Please configure your .env file first:")
         print("   1. Copy .env.example to .env")
         print("   2. Add your API credentials")
         print("   3. Run this test again")
-        print("=" * 60)
+        print(_BAR)
         print()
         sys.exit(1)
     
-    # Test APIs
-    spike_ok = test_spike_api()
-    anthropic_ok = test_anthropic_api()
+    # Test APIs; both probes are network-bound, so run them side by side
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        spike_future = executor.submit(test_spike_api)
+        anthropic_future = executor.submit(test_anthropic_api)
+        spike_ok, anthropic_ok = spike_future.result(), anthropic_future.result()
     
     # Summary
-    print("=" * 60)
-    print("Test Summary")
-    print("=" * 60)
+    print(f"{_BAR}\nTest Summary\n{_BAR}")
     print(f"Environment Variables: {'✅ PASS' if env_ok else '❌ FAIL'}")
     print(f"Spike API:            {'✅ PASS' if spike_ok else '❌ FAIL'}")
     print(f"Anthropic API:        {'✅ PASS' if anthropic_ok else '❌ FAIL'}")
@@ -180,4 +201,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Load environment variables only when run as a script, not on import
+    load_dotenv()
     main()